@@ -48,11 +48,16 @@ def get_local_config():
 def flatten_keys(d, parent_key="", sep="."):
     """Flatten a dictionary to a set of dot-notation keys."""
     keys = set()
-    for k, v in d.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        keys.add(new_key)
-        if isinstance(v, dict):
-            keys.update(flatten_keys(v, new_key, sep=sep))
+    # Walk with an explicit stack so nested tables add straight into one set
+    # instead of building and merging a set per level.
+    stack = [(parent_key, d)]
+    while stack:
+        prefix, table = stack.pop()
+        for k, v in table.items():
+            new_key = f"{prefix}{sep}{k}" if prefix else k
+            keys.add(new_key)
+            if isinstance(v, dict):
+                stack.append((new_key, v))
     return keys
 
 
@@ -412,3 +412,30 @@ class TestMainOrphanClassification:
         assert exit_code == 0
         assert "pinpoint-dead: 0 container(s), 1 volume(s)" in err
         assert stub.calls_of("volume_rm") == []
+
+
+class TestActiveProjectIds:
+    def test_unreadable_config_falls_back_to_branch_id(self, tmp_path: Path) -> None:
+        """An unreadable config.toml (ELOOP here) must not drop a live worktree.
+
+        Skipping it would leave its project out of the active set, and
+        `--apply` would then delete that worktree's containers and volumes.
+        """
+        supabase_dir = tmp_path / "supabase"
+        supabase_dir.mkdir()
+        config = supabase_dir / "config.toml"
+        config.symlink_to(config.name)
+
+        active = sweep.get_active_project_ids({str(tmp_path): "feature/live"})
+
+        assert active == {sweep.branch_to_project_id("feature/live")}
+
+    def test_unreadable_config_on_detached_worktree_is_skipped(
+        self, tmp_path: Path
+    ) -> None:
+        supabase_dir = tmp_path / "supabase"
+        supabase_dir.mkdir()
+        config = supabase_dir / "config.toml"
+        config.symlink_to(config.name)
+
+        assert sweep.get_active_project_ids({str(tmp_path): ""}) == set()
@@ -1,7 +1,9 @@
 """Unit tests for worktree_setup.py env merging and port allocation."""
 
 import json
+import os
 import re
+import subprocess
 import sys
 from pathlib import Path
 
@@ -17,8 +19,10 @@ from worktree_setup import (
     PortConfig,
     allocate_slot,
     branch_to_project_id,
+    configure_branch_tracking,
     generate_config_toml,
     generate_launch_json,
+    get_branch_refs,
     load_manifest,
     merge_env_local,
     parse_env_file,
@@ -26,6 +30,7 @@ from worktree_setup import (
     read_pinned_project_id,
     resolve_brainstorm_server_path,
     resolve_project_id,
+    write_protected_file,
 )
 
 # Testing philosophy for worktree setup
@@ -38,7 +43,9 @@ from worktree_setup import (
 # parsing env files, port allocation, ID derivation, JSON manifest correctness.
 # Don't add unit tests for git/subprocess interactions; those tests test mocks
 # more than real behavior, and the integration path (run the post-checkout
-# hook in a real worktree) is faster and more accurate.
+# hook in a real worktree) is faster and more accurate. The exception is
+# upstream tracking, whose for-each-ref parsing has edge cases (gone upstreams,
+# nested refnames) that are cheap to pin down against a real scratch repo.
 
 
 class TestParseEnvFile:
@@ -513,31 +520,28 @@ class TestManifest:
 class TestBranchToProjectId:
     """Test branch name to project ID conversion."""
 
-    def test_simple_branch_name(self) -> None:
-        assert branch_to_project_id("my-feature") == "pinpoint-my-feature"
-
-    def test_feature_branch_with_slash(self) -> None:
-        assert branch_to_project_id("feat/my-feature") == "pinpoint-feat-my-feature"
-
-    def test_uppercase_is_lowercased(self) -> None:
-        assert branch_to_project_id("Fix/MyBug") == "pinpoint-fix-mybug"
-
-    def test_special_characters_replaced(self) -> None:
-        assert (
-            branch_to_project_id("feat/add_new@feature!")
-            == "pinpoint-feat-add-new-feature"
-        )
-
-    def test_no_double_hyphens(self) -> None:
-        result = branch_to_project_id("/my-feature")
-        assert "--" not in result
-        assert result == "pinpoint-my-feature"
-
-    def test_multiple_consecutive_special_chars(self) -> None:
-        assert (
-            branch_to_project_id("feat///multiple___chars")
-            == "pinpoint-feat-multiple-chars"
-        )
+    @pytest.mark.parametrize(
+        ("branch", "expected"),
+        [
+            pytest.param("my-feature", "pinpoint-my-feature", id="simple"),
+            pytest.param("feat/my-feature", "pinpoint-feat-my-feature", id="slash"),
+            pytest.param("Fix/MyBug", "pinpoint-fix-mybug", id="lowercased"),
+            pytest.param(
+                "feat/add_new@feature!",
+                "pinpoint-feat-add-new-feature",
+                id="special-chars-replaced",
+            ),
+            # A leading separator must not leave "pinpoint--my-feature".
+            pytest.param("/my-feature", "pinpoint-my-feature", id="no-double-hyphens"),
+            pytest.param(
+                "feat///multiple___chars",
+                "pinpoint-feat-multiple-chars",
+                id="consecutive-special-chars",
+            ),
+        ],
+    )
+    def test_short_branch_is_sanitized(self, branch: str, expected: str) -> None:
+        assert branch_to_project_id(branch) == expected
 
     def test_long_branch_name_truncated(self) -> None:
         long_name = "a" * 100
@@ -717,5 +721,162 @@ class TestPinnedProjectId:
         assert resolve_project_id(tmp_path, "feat/renamed") == first.project_id
 
 
+class TestWriteProtectedFile:
+    """Test the atomic read-only write used for generated config files."""
+
+    @staticmethod
+    def _mode(path: Path) -> int:
+        return path.stat().st_mode & 0o777
+
+    @staticmethod
+    def _temp_files(path: Path) -> list[Path]:
+        return list(path.parent.glob(f".{path.name}.*"))
+
+    def test_new_file_is_read_only(self, tmp_path: Path) -> None:
+        target = tmp_path / ".env.local"
+
+        write_protected_file(target, "A=1\n")
+
+        assert target.read_text() == "A=1\n"
+        assert self._mode(target) == 0o444
+        assert self._temp_files(target) == []
+
+    def test_existing_read_only_file_is_overwritten(self, tmp_path: Path) -> None:
+        target = tmp_path / ".env.local"
+        target.write_text("A=1\n")
+        target.chmod(0o444)
+
+        write_protected_file(target, "A=2\n")
+
+        assert target.read_text() == "A=2\n"
+        assert self._mode(target) == 0o444
+        assert self._temp_files(target) == []
+
+    def test_unchanged_file_keeps_mtime_but_gets_mode_fixed(
+        self, tmp_path: Path
+    ) -> None:
+        # Rewriting identical content would bump the mtime and restart any dev
+        # server watching the file; a wrong mode is still repaired in place.
+        target = tmp_path / ".env.local"
+        target.write_text("A=1\n")
+        target.chmod(0o644)
+        os.utime(target, ns=(1_000_000_000, 1_000_000_000))
+
+        write_protected_file(target, "A=1\n")
+
+        assert target.stat().st_mtime_ns == 1_000_000_000
+        assert self._mode(target) == 0o444
+
+    def test_failed_write_leaves_no_temp_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        target = tmp_path / ".env.local"
+        target.write_text("A=1\n")
+
+        def fail_replace(src: str, dst: str) -> None:
+            raise OSError("simulated rename failure")
+
+        monkeypatch.setattr(os, "replace", fail_replace)
+
+        with pytest.raises(OSError, match="simulated rename failure"):
+            write_protected_file(target, "A=2\n")
+
+        assert target.read_text() == "A=1\n"
+        assert self._temp_files(target) == []
+
+
+class TestBranchTracking:
+    """Test upstream detection and repair against a real scratch git repo."""
+
+    @staticmethod
+    def _git(repo: Path, *args: str) -> str:
+        return subprocess.run(
+            ["git", "-C", str(repo), *args],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path) -> Path:
+        self._git(tmp_path, "init", "-q", "-b", "main")
+        self._git(
+            tmp_path,
+            "-c",
+            "user.email=test@example.com",
+            "-c",
+            "user.name=test",
+            "commit",
+            "-q",
+            "--allow-empty",
+            "-m",
+            "init",
+        )
+        # --set-upstream-to needs a configured remote; it is never fetched.
+        self._git(tmp_path, "remote", "add", "origin", str(tmp_path / "nowhere"))
+        return tmp_path
+
+    def _remote_branch(self, repo: Path, name: str) -> None:
+        self._git(repo, "update-ref", f"refs/remotes/origin/{name}", "HEAD")
+
+    def _branch(self, repo: Path, name: str, upstream: str | None = None) -> None:
+        self._git(repo, "branch", name)
+        if upstream:
+            self._git(repo, "branch", f"--set-upstream-to={upstream}", name)
+
+    def _upstream(self, repo: Path, name: str) -> str | None:
+        result = subprocess.run(
+            ["git", "-C", str(repo), "rev-parse", "--abbrev-ref", f"{name}@{{u}}"],
+            capture_output=True,
+            text=True,
+        )
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def test_no_upstream_tracks_remote_branch(self, repo: Path) -> None:
+        self._remote_branch(repo, "feat")
+        self._branch(repo, "feat")
+
+        assert get_branch_refs("feat", repo) == (None, True)
+        configure_branch_tracking("feat", repo)
+        assert self._upstream(repo, "feat") == "origin/feat"
+
+    def test_matching_upstream_is_left_alone(self, repo: Path) -> None:
+        self._remote_branch(repo, "feat")
+        self._branch(repo, "feat", upstream="origin/feat")
+
+        assert get_branch_refs("feat", repo) == ("origin/feat", True)
+        configure_branch_tracking("feat", repo)
+        assert self._upstream(repo, "feat") == "origin/feat"
+
+    def test_existing_custom_upstream_is_preserved(self, repo: Path) -> None:
+        self._remote_branch(repo, "feat")
+        self._remote_branch(repo, "integration")
+        self._branch(repo, "feat", upstream="origin/integration")
+
+        assert get_branch_refs("feat", repo) == ("origin/integration", True)
+        configure_branch_tracking("feat", repo)
+        assert self._upstream(repo, "feat") == "origin/integration"
+
+    def test_gone_custom_upstream_retracks_remote_branch(self, repo: Path) -> None:
+        # A deleted upstream reads as "[gone]"; it isn't a custom upstream worth
+        # keeping, and leaving it makes `git pull` fail.
+        self._remote_branch(repo, "feat")
+        self._remote_branch(repo, "integration")
+        self._branch(repo, "feat", upstream="origin/integration")
+        self._git(repo, "update-ref", "-d", "refs/remotes/origin/integration")
+
+        assert get_branch_refs("feat", repo) == (None, True)
+        configure_branch_tracking("feat", repo)
+        assert self._upstream(repo, "feat") == "origin/feat"
+
+    def test_nested_refs_do_not_match(self, repo: Path) -> None:
+        # for-each-ref patterns also match refs *under* the path, so
+        # refs/heads/feat/x must not be mistaken for refs/heads/feat.
+        self._remote_branch(repo, "feat/x")
+        self._branch(repo, "feat/x", upstream="origin/feat/x")
+
+        assert get_branch_refs("feat", repo) == (None, False)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
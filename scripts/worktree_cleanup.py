@@ -31,8 +31,10 @@ query filtered on a label nothing carries returns a clean, wrong zero.
 import fcntl
 import json
 import shlex
+import stat
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -329,8 +331,13 @@ def main() -> int:
     # pointer. A caller pointing this script at the main worktree (e.g., a
     # cleanup script that misidentified the path) would otherwise stop the
     # user's primary Supabase and try to remove their main checkout.
-    git_marker = worktree_path / ".git"
-    if git_marker.is_dir():
+    # One stat answers both questions below (directory = main worktree, file =
+    # linked worktree, absent = partially removed).
+    try:
+        git_marker_mode = (worktree_path / ".git").stat().st_mode
+    except OSError:
+        git_marker_mode = 0
+    if stat.S_ISDIR(git_marker_mode):
         print(
             f"Refusing to clean up the main worktree at {worktree_path}. "
             "worktree_cleanup.py is for additional (git worktree add) worktrees only.",
@@ -343,7 +350,7 @@ def main() -> int:
     # can't safely target the Supabase project_id. Skip the Docker/Supabase
     # phase but still deallocate the slot — otherwise the manifest entry leaks
     # forever. worktree_orphan_sweep.py picks up any leaked Docker resources.
-    git_marker_present = git_marker.is_file()
+    git_marker_present = stat.S_ISREG(git_marker_mode)
     if not git_marker_present:
         print(
             f"Warning: {worktree_path} has no .git marker — skipping Supabase/Docker "
@@ -372,13 +379,21 @@ def main() -> int:
         # Stop Supabase. Failures here are non-fatal: a missing project_ref or
         # a stack that was never started both look like errors but don't block
         # slot deallocation.
+        #
+        # The volume query only reads labels set at volume creation, so it runs
+        # while the (multi-second) stop is still in flight. Removal still waits
+        # for the stop: volumes can't be removed while its containers hold them.
         print(f"Stopping Supabase for {branch}...", file=sys.stderr)
-        stop_result = subprocess.run(
-            ["supabase", "stop"],
-            cwd=worktree_path,
-            capture_output=True,
-            text=True,
-        )
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            stop_future = pool.submit(
+                subprocess.run,
+                ["supabase", "stop"],
+                cwd=worktree_path,
+                capture_output=True,
+                text=True,
+            )
+            query = list_project_volumes(project_id)
+            stop_result = stop_future.result()
         if stop_result.returncode != 0:
             print(
                 f"Warning: `supabase stop` exited {stop_result.returncode}: "
@@ -389,7 +404,6 @@ def main() -> int:
         # Remove Docker volumes. A query that failed is unknown, NOT zero
         # (PP-3w4g): reporting "removed 0 volume(s)" for a query that never ran
         # is how volumes leak permanently past a teardown that claimed success.
-        query = list_project_volumes(project_id)
         if query.is_unknown:
             volumes_unknown_reason = query.unknown_reason
             print(
@@ -420,7 +434,8 @@ def main() -> int:
     if git_marker_present:
         subprocess.run(
             ["git", "worktree", "unlock", str(worktree_path)],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
 
         result = subprocess.run(
@@ -441,7 +456,11 @@ def main() -> int:
             )
             return EXIT_FAILED
 
-        subprocess.run(["git", "worktree", "prune"], capture_output=True)
+        subprocess.run(
+            ["git", "worktree", "prune"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
 
     deallocate_slot(str(worktree_path))
 
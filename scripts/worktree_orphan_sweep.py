@@ -37,6 +37,7 @@ import re
 import shlex
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -94,25 +95,30 @@ def get_active_project_ids(worktrees: dict[str, str]) -> set[str]:
     is the authoritative source for the project_id that Supabase containers
     actually use, and it works for detached worktrees and for worktrees whose
     branch was renamed after setup. Falls back to `branch_to_project_id(branch)`
-    only when the config.toml is missing and the worktree is on a named branch.
+    only when the config.toml can't be read (missing, unreadable, symlink loop)
+    and the worktree is on a named branch — a live worktree must never drop out
+    of the active set just because its config is temporarily unreadable.
 
-    Worktrees we can't resolve (detached + missing config.toml) are intentionally
-    skipped so the caller never deletes a Docker project we don't recognize.
+    Worktrees we can't resolve (detached + unreadable config.toml) are
+    intentionally skipped so the caller never deletes a Docker project we don't
+    recognize.
     """
     project_ids: set[str] = set()
     for path_str, branch in worktrees.items():
         config_path = Path(path_str) / "supabase" / "config.toml"
-        if config_path.is_file():
-            try:
-                for line in config_path.read_text().splitlines():
-                    match = _PROJECT_ID_LINE_RE.match(line)
-                    if match:
-                        project_ids.add(match.group(1))
-                        break
-            except OSError:
-                pass
-        elif branch:
-            project_ids.add(branch_to_project_id(branch))
+        # Read first rather than stat-ing with is_file() and then opening: any
+        # failure to read (missing, EACCES, ELOOP, ...) takes the branch fallback.
+        try:
+            content = config_path.read_text()
+        except OSError:
+            if branch:
+                project_ids.add(branch_to_project_id(branch))
+            continue
+        for line in content.splitlines():
+            match = _PROJECT_ID_LINE_RE.match(line)
+            if match:
+                project_ids.add(match.group(1))
+                break
     return project_ids
 
 
@@ -143,8 +149,9 @@ def get_orphan_slot_paths() -> list[str]:
         slots = {}
     orphans: list[str] = []
     for path_str in slots:
-        path = Path(path_str)
-        if not path.is_dir() or not (path / ".git").exists():
+        # `<path>/.git` can only exist if `<path>` is a directory, so one stat
+        # answers both "missing on disk" and "no .git marker".
+        if not os.path.exists(os.path.join(path_str, ".git")):
             orphans.append(path_str)
     return orphans
 
@@ -291,9 +298,15 @@ def get_supabase_resources_by_project(not_quiet: bool) -> DockerSweepResult:
     one — including a partial failure, since a project whose containers listed
     but whose volumes didn't would otherwise report a false `0 volume(s)`.
     """
+    # The two enumerations are independent docker CLI round-trips, so overlap
+    # them. Results are still collected volumes-first, so which error wins
+    # when both fail is the same as running them back to back.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        volumes_future = pool.submit(get_supabase_volumes)
+        containers_future = pool.submit(get_supabase_containers)
     try:
-        volumes = get_supabase_volumes()
-        containers = get_supabase_containers()
+        volumes = volumes_future.result()
+        containers = containers_future.result()
     except DockerNotInstalledError as exc:
         # No docker binary means there are genuinely no Docker resources here,
         # so an empty (not unknown) result is the honest answer.
@@ -442,39 +455,53 @@ def main() -> int:
         if not_quiet:
             print(f"  deallocated slot: {path_str}", file=sys.stderr)
 
-    for pid, res in sorted(orphan_projects.items()):
-        if res["containers"]:
-            rm = subprocess.run(
-                ["docker", "rm", "-f"] + res["containers"],
-                capture_output=True,
-                text=True,
+    # One `docker rm -f` / `docker volume rm` across every orphan project
+    # rather than a pair per project: each docker CLI call pays its own
+    # startup + daemon round-trip. A failed batch can span several projects,
+    # so warnings list every project in it; docker's stderr names the object
+    # that actually failed. Containers go first so the volumes they hold are
+    # no longer in use.
+    by_pid = sorted(orphan_projects.items())
+    container_pids = [pid for pid, res in by_pid if res["containers"]]
+    volume_pids = [pid for pid, res in by_pid if res["volumes"]]
+    orphan_containers = [c for _, res in by_pid for c in res["containers"]]
+    orphan_volumes = [v for _, res in by_pid for v in res["volumes"]]
+    if orphan_containers:
+        rm = subprocess.run(
+            ["docker", "rm", "-f"] + orphan_containers,
+            capture_output=True,
+            text=True,
+        )
+        if rm.returncode != 0:
+            print(
+                f"  Warning: `docker rm -f` for {', '.join(container_pids)}: "
+                f"{rm.stderr.strip()}",
+                file=sys.stderr,
+            )
+        elif not_quiet:
+            print(
+                f"  removed {len(orphan_containers)} container(s) across "
+                f"{len(container_pids)} project(s)",
+                file=sys.stderr,
             )
-            if rm.returncode != 0:
-                print(
-                    f"  Warning: `docker rm -f` for {pid}: {rm.stderr.strip()}",
-                    file=sys.stderr,
-                )
-            elif not_quiet:
-                print(
-                    f"  removed {len(res['containers'])} container(s) for {pid}",
-                    file=sys.stderr,
-                )
-        if res["volumes"]:
-            rm = subprocess.run(
-                ["docker", "volume", "rm"] + res["volumes"],
-                capture_output=True,
-                text=True,
+    if orphan_volumes:
+        rm = subprocess.run(
+            ["docker", "volume", "rm"] + orphan_volumes,
+            capture_output=True,
+            text=True,
+        )
+        if rm.returncode != 0:
+            print(
+                f"  Warning: `docker volume rm` for {', '.join(volume_pids)}: "
+                f"{rm.stderr.strip()}",
+                file=sys.stderr,
+            )
+        elif not_quiet:
+            print(
+                f"  removed {len(orphan_volumes)} volume(s) across "
+                f"{len(volume_pids)} project(s)",
+                file=sys.stderr,
             )
-            if rm.returncode != 0:
-                print(
-                    f"  Warning: `docker volume rm` for {pid}: {rm.stderr.strip()}",
-                    file=sys.stderr,
-                )
-            elif not_quiet:
-                print(
-                    f"  removed {len(res['volumes'])} volume(s) for {pid}",
-                    file=sys.stderr,
-                )
 
     if docker.is_unknown:
         print(
@@ -105,6 +105,15 @@ EXIT_CLEANUP_UNRUNNABLE = 7
 #: is bounded by process spawn cost, not by the API: ~60 branches finish in
 #: under 2s at 12, which keeps the SessionStart hook inside its 10s ceiling.
 GH_CONCURRENCY = 12
+#: How many worktrees' `git status` / `rev-list` pairs to run at once. Each is
+#: purely local, so the cap exists to keep a host with dozens of agent worktrees
+#: from forking dozens of git processes against one object store at the same
+#: moment, not to respect any remote limit.
+GIT_CONCURRENCY = 4
+#: How many `du -sk` walks to run at once for the REAP size column. Each one
+#: stats every file under a worktree (node_modules included), so the cap keeps
+#: the walks from thrashing a single disk rather than speeding up a CPU bound.
+DU_CONCURRENCY = 4
 
 TIER_REAP = "REAP"
 TIER_REVIEW = "REVIEW"
@@ -272,7 +281,16 @@ def read_git_state(worktree: Path) -> GitState:
             oid = line[len("# branch.oid ") :].strip()
             head = None if oid == "(initial)" else oid
         elif not line.startswith("# "):
+            # Headers always precede entries, so the first entry settles both
+            # answers; a tree with thousands of untracked files needn't be
+            # walked line by line just to learn it is dirty.
             dirty = True
+            break
+
+    # classify() sends a dirty tree to REVIEW before it ever looks at `ahead`,
+    # so the rev-list would be a git spawn whose answer is never read.
+    if dirty:
+        return GitState(head=head, dirty=dirty)
 
     try:
         ahead_result = subprocess.run(
@@ -292,6 +310,14 @@ def read_git_state(worktree: Path) -> GitState:
     return GitState(head=head, dirty=dirty, ahead=ahead)
 
 
+def read_all_git_states(paths: list[str]) -> dict[str, GitState]:
+    """Read every worktree's git state concurrently, bounded by GIT_CONCURRENCY."""
+    if not paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(GIT_CONCURRENCY, len(paths))) as pool:
+        return dict(zip(paths, pool.map(lambda p: read_git_state(Path(p)), paths)))
+
+
 def live_process_cwds() -> tuple[set[str], str | None]:
     """Directories that are some running process's cwd, or a reason we can't tell.
 
@@ -300,19 +326,21 @@ def live_process_cwds() -> tuple[set[str], str | None]:
     hold whether or not a shell happens to be sitting in the directory. So an
     unavailable scan is a note, not a refusal.
     """
-    proc = Path("/proc")
-    if proc.is_dir():
+    # Plain strings rather than a Path per entry: a busy host has thousands of
+    # /proc entries, and this is the only loop here that scales with them.
+    if os.path.isdir("/proc"):
         cwds: set[str] = set()
-        for entry in proc.iterdir():
-            if not entry.name.isdigit():
-                continue
-            try:
-                cwds.add(os.readlink(entry / "cwd"))
-            except OSError:
-                # Another user's process, or one that exited mid-scan. Both are
-                # fine to skip: neither is a worktree we could be about to reap
-                # without also owning it.
-                continue
+        with os.scandir("/proc") as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                try:
+                    cwds.add(os.readlink(f"{entry.path}/cwd"))
+                except OSError:
+                    # Another user's process, or one that exited mid-scan. Both
+                    # are fine to skip: neither is a worktree we could be about
+                    # to reap without also owning it.
+                    continue
         return cwds, None
 
     try:
@@ -419,6 +447,14 @@ def directory_size_kib(path: str) -> int | None:
         return None
 
 
+def directory_sizes_kib(paths: list[str]) -> dict[str, int | None]:
+    """Size every path with `du` concurrently, bounded by DU_CONCURRENCY."""
+    if not paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(DU_CONCURRENCY, len(paths))) as pool:
+        return dict(zip(paths, pool.map(directory_size_kib, paths)))
+
+
 def format_kib(kib: int) -> str:
     size = float(kib)
     for unit in ("KiB", "MiB"):
@@ -528,12 +564,13 @@ def main() -> int:
         )
 
     self_cwd = Path.cwd().resolve()
+    git_states = read_all_git_states(sorted(worktrees))
     verdicts = [
         classify(
             path,
             branch,
             lookups.get(branch, PrLookup()),
-            read_git_state(Path(path)),
+            git_states[path],
             live_cwds,
             self_cwd,
         )
@@ -560,6 +597,7 @@ def main() -> int:
         )
 
     if not_quiet:
+        sizes = directory_sizes_kib([v.path for v in reapable])
         for title, group in (
             (f"REAP ({merged_count} merged, {empty_count} empty)", reapable),
             ("REVIEW — unmerged commits or a dirty tree; never touched", review),
@@ -567,11 +605,7 @@ def main() -> int:
         ):
             print(f"\n{title}: {len(group)}", file=sys.stderr)
             for verdict in group:
-                size = (
-                    directory_size_kib(verdict.path)
-                    if verdict.tier == TIER_REAP
-                    else None
-                )
+                size = sizes.get(verdict.path) if verdict.tier == TIER_REAP else None
                 suffix = f", {format_kib(size)}" if size is not None else ""
                 print(
                     f"  - {verdict.branch or '(detached)'} [{verdict.reason}{suffix}]\n"
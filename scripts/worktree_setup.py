@@ -7,7 +7,9 @@ Existing worktrees get their configs regenerated on branch switch.
 Not a CLI tool — no argparse, no subcommands. Operates on $PWD.
 """
 
+import contextlib
 import fcntl
+import functools
 import hashlib
 import json
 import os
@@ -16,6 +18,7 @@ import shlex
 import stat
 import subprocess
 import sys
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -45,24 +48,26 @@ LOCAL_SUPABASE_SERVICE_ROLE_KEY = (
 )
 
 # Keys that this script manages (port-dependent and local dev defaults)
-MANAGED_ENV_KEYS = {
-    "NEXT_PUBLIC_SUPABASE_URL",
-    "POSTGRES_URL",
-    "POSTGRES_URL_NON_POOLING",
-    "PORT",
-    "NEXT_PUBLIC_SITE_URL",
-    "EMAIL_TRANSPORT",
-    "MAILPIT_PORT",
-    "MAILPIT_SMTP_PORT",
-    "INBUCKET_PORT",
-    "INBUCKET_SMTP_PORT",
-    "DEV_AUTOLOGIN_ENABLED",
-    "DEV_AUTOLOGIN_EMAIL",
-    "DEV_AUTOLOGIN_PASSWORD",
-    "NEXT_PUBLIC_SUPABASE_PUBLISHABLE_KEY",
-    "SUPABASE_SERVICE_ROLE_KEY",
-    "UNSUBSCRIBE_SIGNING_SECRET",
-}
+MANAGED_ENV_KEYS = frozenset(
+    {
+        "NEXT_PUBLIC_SUPABASE_URL",
+        "POSTGRES_URL",
+        "POSTGRES_URL_NON_POOLING",
+        "PORT",
+        "NEXT_PUBLIC_SITE_URL",
+        "EMAIL_TRANSPORT",
+        "MAILPIT_PORT",
+        "MAILPIT_SMTP_PORT",
+        "INBUCKET_PORT",
+        "INBUCKET_SMTP_PORT",
+        "DEV_AUTOLOGIN_ENABLED",
+        "DEV_AUTOLOGIN_EMAIL",
+        "DEV_AUTOLOGIN_PASSWORD",
+        "NEXT_PUBLIC_SUPABASE_PUBLISHABLE_KEY",
+        "SUPABASE_SERVICE_ROLE_KEY",
+        "UNSUBSCRIBE_SIGNING_SECRET",
+    }
+)
 
 CONFIG_HEADER = """\
 # ⚠️ AUTO-GENERATED — DO NOT EDIT ⚠️
@@ -150,9 +155,11 @@ def load_manifest() -> dict[str, int]:
     """Load the slot manifest, creating it if missing. Tolerates corruption."""
     if not MANIFEST_PATH.exists():
         MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
-        MANIFEST_PATH.write_text(json.dumps({"version": 1, "slots": {}}, indent=2))
+        MANIFEST_PATH.write_text(
+            json.dumps({"version": 1, "slots": {}}, indent=2), encoding="utf-8"
+        )
     try:
-        data = json.loads(MANIFEST_PATH.read_text())
+        data = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
         return data.get("slots", {})
     except (json.JSONDecodeError, KeyError):
         return {}
@@ -187,9 +194,11 @@ def allocate_slot(worktree_path: str) -> int:
     MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
 
     if not MANIFEST_PATH.exists():
-        MANIFEST_PATH.write_text(json.dumps({"version": 1, "slots": {}}, indent=2))
+        MANIFEST_PATH.write_text(
+            json.dumps({"version": 1, "slots": {}}, indent=2), encoding="utf-8"
+        )
 
-    with open(MANIFEST_PATH, "r+") as f:
+    with open(MANIFEST_PATH, "r+", encoding="utf-8") as f:
         fcntl.flock(f, fcntl.LOCK_EX)
         try:
             slots = _read_manifest_locked(f)
@@ -243,6 +252,9 @@ HASH_SUFFIX_LEN = 8
 # +1 for the "-" separator joining the readable part to the hash.
 MAX_READABLE_LEN = MAX_PROJECT_ID_LEN - HASH_SUFFIX_LEN - 1
 
+_PROJECT_ID_INVALID_CHARS_RE = re.compile(r"[^a-z0-9-]")
+_DASH_RUN_RE = re.compile(r"-+")
+
 
 def branch_to_project_id(branch_name: str) -> str:
     """Convert a branch name to a valid Supabase project ID.
@@ -254,8 +266,8 @@ def branch_to_project_id(branch_name: str) -> str:
 
     Cap is 40 chars; see MAX_PROJECT_ID_LEN comment above for why.
     """
-    sanitized = re.sub(r"[^a-z0-9-]", "-", branch_name.lower())
-    full = re.sub(r"-+", "-", f"pinpoint-{sanitized}").strip("-")
+    sanitized = _PROJECT_ID_INVALID_CHARS_RE.sub("-", branch_name.lower())
+    full = _DASH_RUN_RE.sub("-", f"pinpoint-{sanitized}").strip("-")
     if len(full) <= MAX_PROJECT_ID_LEN:
         return full
     digest = hashlib.sha256(branch_name.encode("utf-8")).hexdigest()[:HASH_SUFFIX_LEN]
@@ -296,7 +308,9 @@ def read_pinned_project_id(worktree_path: Path) -> str | None:
     where an exception would skip the rest of the worktree's config generation.
     """
     try:
-        content = (worktree_path / "supabase" / "config.toml").read_text()
+        content = (worktree_path / "supabase" / "config.toml").read_text(
+            encoding="utf-8"
+        )
     except (OSError, UnicodeDecodeError):
         return None
 
@@ -333,35 +347,48 @@ def resolve_project_id(worktree_path: Path, branch: str) -> str:
     return pinned
 
 
+# The template's own `project_id = "..."` line, replaced with the worktree's id.
+_TEMPLATE_PROJECT_ID_RE = re.compile(r'^project_id = ".*"', re.MULTILINE)
+
+# Template base ports and the PortConfig attribute each one is rewritten to.
+# Each base port is unique in the template, so a word-boundary match on the
+# number alone is enough to find it. One alternation covers all of them, and
+# slot offsets are multiples of 100 so a rewritten port never lands on another
+# base port: a single pass gives the same result as one re.sub per port.
+_TEMPLATE_PORTS = (
+    (BASE_PORT_API, "api_port"),
+    (BASE_PORT_DB, "db_port"),
+    (BASE_PORT_SHADOW, "shadow_port"),
+    (BASE_PORT_POOLER, "pooler_port"),
+    (BASE_PORT_INBUCKET, "inbucket_port"),
+    (BASE_PORT_SMTP, "smtp_port"),
+    (BASE_PORT_POP3, "pop3_port"),
+)
+_BASE_PORT_RE = re.compile(
+    r"\b(" + "|".join(str(base_port) for base_port, _ in _TEMPLATE_PORTS) + r")\b"
+)
+
+
 def generate_config_toml(worktree_path: Path, port_config: PortConfig) -> str:
     """Generate config.toml from template with port substitutions."""
     template_path = worktree_path / "supabase" / "config.toml.template"
     if not template_path.exists():
         raise FileNotFoundError(f"Template not found: {template_path}")
 
-    content = template_path.read_text()
+    content = template_path.read_text(encoding="utf-8")
 
     # Replace project_id
-    content = re.sub(
-        r'^project_id = ".*"',
-        f'project_id = "{port_config.project_id}"',
-        content,
-        flags=re.MULTILINE,
+    content = _TEMPLATE_PROJECT_ID_RE.sub(
+        f'project_id = "{port_config.project_id}"', content
     )
 
-    # Replace ports using word-boundary matching (each base port is unique)
+    # Replace ports (see _TEMPLATE_PORTS)
     port_map = {
-        BASE_PORT_API: port_config.api_port,
-        BASE_PORT_DB: port_config.db_port,
-        BASE_PORT_SHADOW: port_config.shadow_port,
-        BASE_PORT_POOLER: port_config.pooler_port,
-        BASE_PORT_INBUCKET: port_config.inbucket_port,
-        BASE_PORT_SMTP: port_config.smtp_port,
-        BASE_PORT_POP3: port_config.pop3_port,
+        str(base_port): str(getattr(port_config, attr))
+        for base_port, attr in _TEMPLATE_PORTS
     }
-    for old_port, new_port in port_map.items():
-        if old_port != new_port:
-            content = re.sub(rf"\b{old_port}\b", str(new_port), content)
+    if any(old_port != new_port for old_port, new_port in port_map.items()):
+        content = _BASE_PORT_RE.sub(lambda m: port_map[m.group(1)], content)
 
     # Replace site_url and redirect URLs (port 3000 → worktree's port)
     if port_config.nextjs_port != BASE_PORT_NEXTJS:
@@ -375,7 +402,7 @@ def generate_config_toml(worktree_path: Path, port_config: PortConfig) -> str:
 def parse_env_file(path: Path) -> dict[str, str]:
     """Parse .env file into dict, ignoring comments and blank lines."""
     result: dict[str, str] = {}
-    for line in path.read_text().splitlines():
+    for line in path.read_text(encoding="utf-8").splitlines():
         line = line.strip()
         if not line or line.startswith("#"):
             continue
@@ -427,19 +454,21 @@ def format_env_file(
     if custom_keys:
         lines.append("")
         lines.append("# === Custom keys (preserved on regeneration) ===")
-        for key, value in custom_keys.items():
-            lines.append(f"{key}={value}")
+        lines.extend(f"{key}={value}" for key, value in custom_keys.items())
 
     lines.append("")
     return "\n".join(lines)
 
 
-def _read_user_keys(env_file: Path) -> dict[str, str]:
-    """Read non-managed (user-supplied) keys from a .env.local file.
-    Returns {} when the file doesn't exist."""
+def _read_env_local(env_file: Path) -> dict[str, str]:
+    """Parse a .env.local file. Returns {} when the file doesn't exist."""
     if not env_file.exists():
         return {}
-    existing = parse_env_file(env_file)
+    return parse_env_file(env_file)
+
+
+def _user_keys(existing: dict[str, str]) -> dict[str, str]:
+    """Keep only the non-managed (user-supplied) keys of a parsed .env.local."""
     return {k: v for k, v in existing.items() if k not in MANAGED_ENV_KEYS}
 
 
@@ -452,34 +481,22 @@ UNSUBSCRIBE_SIGNING_SECRET_PLACEHOLDER = (
 )
 
 
-def _read_managed_value(env_file: Path, key: str) -> str | None:
-    """Read a single MANAGED key's existing value from a .env.local file.
-
-    Bypasses the MANAGED_ENV_KEYS filter so callers can preserve user-set
-    values for keys that are conceptually managed (e.g., signing secrets).
-    Returns None when the file or key is absent.
-    """
-    if not env_file.exists():
-        return None
-    existing = parse_env_file(env_file)
-    return existing.get(key)
-
-
-def _resolve_unsubscribe_secret(worktree_path: Path, main_path: Path | None) -> str:
+def _resolve_unsubscribe_secret(
+    target_env: dict[str, str], main_env: dict[str, str] | None
+) -> str:
     """Pick the best UNSUBSCRIBE_SIGNING_SECRET for this worktree.
 
     Precedence (target > main > placeholder), and any value that is not the
     placeholder wins over the placeholder. This means a developer's real
     secret in main's .env.local automatically propagates to fresh worktrees,
     and a per-worktree edit is preserved across regenerations.
+
+    Reads the managed key straight from the parsed files, bypassing the
+    MANAGED_ENV_KEYS filter, so a user-set value for it survives.
     """
-    candidates: list[str | None] = [
-        _read_managed_value(worktree_path / ".env.local", "UNSUBSCRIBE_SIGNING_SECRET"),
-    ]
-    if main_path is not None and main_path != worktree_path:
-        candidates.append(
-            _read_managed_value(main_path / ".env.local", "UNSUBSCRIBE_SIGNING_SECRET")
-        )
+    candidates: list[str | None] = [target_env.get("UNSUBSCRIBE_SIGNING_SECRET")]
+    if main_env is not None:
+        candidates.append(main_env.get("UNSUBSCRIBE_SIGNING_SECRET"))
 
     for value in candidates:
         if value and value != UNSUBSCRIBE_SIGNING_SECRET_PLACEHOLDER:
@@ -496,23 +513,24 @@ def merge_env_local(worktree_path: Path, port_config: PortConfig) -> str:
     always win — main's keys only fill gaps. This makes shared secrets
     propagate automatically without manual copying.
     """
-    target_keys = _read_user_keys(worktree_path / ".env.local")
+    # Each file is parsed once and shared by the user-key merge and the
+    # signing-secret lookup below.
+    target_env = _read_env_local(worktree_path / ".env.local")
 
-    main_path: Path | None = None
-    main_keys: dict[str, str] = {}
+    main_env: dict[str, str] | None = None
     try:
         main_path = get_main_worktree()
         if main_path != worktree_path:
-            main_keys = _read_user_keys(main_path / ".env.local")
+            main_env = _read_env_local(main_path / ".env.local")
     except Exception:
         # If git worktree introspection fails for any reason, just skip
         # the inheritance step rather than blocking the whole setup.
         pass
 
     # Target wins; main fills gaps.
-    user_values = {**main_keys, **target_keys}
+    user_values = {**_user_keys(main_env or {}), **_user_keys(target_env)}
 
-    unsubscribe_secret = _resolve_unsubscribe_secret(worktree_path, main_path)
+    unsubscribe_secret = _resolve_unsubscribe_secret(target_env, main_env)
 
     managed_values = {
         "NEXT_PUBLIC_SUPABASE_URL": f"http://localhost:{port_config.api_port}",
@@ -540,11 +558,35 @@ def merge_env_local(worktree_path: Path, port_config: PortConfig) -> str:
 
 
 def write_protected_file(path: Path, content: str) -> None:
-    """Write a file and set it to read-only (444)."""
-    if path.exists():
-        path.chmod(stat.S_IRUSR | stat.S_IWUSR | stat.S_IRGRP | stat.S_IROTH)
-    path.write_text(content)
-    path.chmod(stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    """Write a file and set it to read-only (444).
+
+    Written to a temp file in the same directory and renamed over the target,
+    so a crash mid-write never leaves a truncated read-only file behind (and
+    the old 444 copy never needs to be made writable first).
+
+    A file that already holds exactly this content is left alone (at most its
+    mode is fixed): rewriting it would bump its mtime on every checkout and
+    restart any dev server watching .env.local for nothing.
+    """
+    read_only = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+    try:
+        if path.read_text(encoding="utf-8") == content:
+            if stat.S_IMODE(path.stat().st_mode) != read_only:
+                path.chmod(read_only)
+            return
+    except (OSError, UnicodeDecodeError):
+        pass  # missing or unreadable: (re)write it below
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            os.fchmod(f.fileno(), read_only)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
 
 
 def resolve_brainstorm_server_path() -> str | None:
@@ -623,7 +665,7 @@ def generate_launch_json(worktree_path: Path, port_config: PortConfig) -> None:
         },
         indent=2,
     )
-    launch_path.write_text(content + "\n")
+    launch_path.write_text(content + "\n", encoding="utf-8")
 
 
 # =============================================================================
@@ -631,8 +673,13 @@ def generate_launch_json(worktree_path: Path, port_config: PortConfig) -> None:
 # =============================================================================
 
 
+@functools.cache
 def get_main_worktree() -> Path:
-    """Get the path to the main (first) worktree."""
+    """Get the path to the main (first) worktree.
+
+    Cached: both main() and merge_env_local() need it, and the answer can't
+    change within a single hook run.
+    """
     result = subprocess.run(
         ["git", "worktree", "list", "--porcelain"],
         capture_output=True,
@@ -656,24 +703,47 @@ def get_branch() -> str:
     return result.stdout.strip()
 
 
-def get_current_upstream(branch: str, worktree_path: Path) -> str | None:
-    """Return current upstream ref (e.g. 'origin/main') or None if unset."""
+def get_branch_refs(branch: str, worktree_path: Path) -> tuple[str | None, bool]:
+    """Return (current upstream e.g. 'origin/main' or None, origin/<branch> exists).
+
+    One `git for-each-ref` answers both questions instead of a `rev-parse @{u}`
+    plus a `rev-parse --verify` for the remote ref. for-each-ref patterns also
+    match refs *under* the given path (refs/heads/<branch>/...), so refnames
+    are compared exactly.
+
+    An upstream whose remote ref is gone (`%(upstream:track)` = "[gone]") is
+    reported as None, exactly as the failing `rev-parse @{u}` used to: a deleted
+    upstream is not a custom one worth preserving, and leaving it in place
+    makes `git pull` fail.
+    """
+    local_ref = f"refs/heads/{branch}"
+    remote_ref = f"refs/remotes/origin/{branch}"
     result = subprocess.run(
         [
             "git",
             "-C",
             str(worktree_path),
-            "rev-parse",
-            "--abbrev-ref",
-            "--symbolic-full-name",
-            f"{branch}@{{u}}",
+            "for-each-ref",
+            "--format=%(refname) %(upstream:short) %(upstream:track)",
+            local_ref,
+            remote_ref,
         ],
         capture_output=True,
         text=True,
     )
     if result.returncode != 0:
-        return None
-    return result.stdout.strip() or None
+        return None, False
+    upstream: str | None = None
+    has_remote = False
+    for line in result.stdout.splitlines():
+        # Refnames and short upstream names never contain spaces; only the
+        # track field can ("[ahead 1, behind 2]"), so it takes the remainder.
+        refname, short_upstream, track = (line.split(" ", 2) + ["", ""])[:3]
+        if refname == local_ref:
+            upstream = None if track == "[gone]" else short_upstream or None
+        elif refname == remote_ref:
+            has_remote = True
+    return upstream, has_remote
 
 
 def configure_branch_tracking(branch: str, worktree_path: Path) -> None:
@@ -686,32 +756,17 @@ def configure_branch_tracking(branch: str, worktree_path: Path) -> None:
     if branch in ("main", "master", "HEAD"):
         return
 
-    current = get_current_upstream(branch, worktree_path)
+    current, has_remote = get_branch_refs(branch, worktree_path)
     if current and current not in ("origin/main", "origin/master", f"origin/{branch}"):
         return  # respect existing custom upstream
 
-    has_remote = (
-        subprocess.run(
-            [
-                "git",
-                "-C",
-                str(worktree_path),
-                "rev-parse",
-                "--verify",
-                "--quiet",
-                f"refs/remotes/origin/{branch}",
-            ],
-            capture_output=True,
-        ).returncode
-        == 0
-    )
-
     if not has_remote:
         # Clear the stale origin/main upstream so `git pull` doesn't pull from main.
         if current in ("origin/main", "origin/master"):
             subprocess.run(
                 ["git", "-C", str(worktree_path), "branch", "--unset-upstream", branch],
-                capture_output=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
             )
         print(
             f"worktree_setup: '{branch}' has no remote yet — "
@@ -802,10 +857,12 @@ def main() -> None:
     wt_beads = worktree_path / ".beads"
     if main_beads.is_dir() and not (wt_beads / "dolt").exists():
         wt_beads.mkdir(exist_ok=True)
-        redirect_file = wt_beads / "redirect"
-        if not redirect_file.exists():
-            rel_path = os.path.relpath(main_beads, worktree_path)
-            redirect_file.write_text(rel_path + "\n")
+        # Exclusive create: one open() both checks for and writes the redirect,
+        # and never clobbers one the developer has pointed elsewhere.
+        rel_path = os.path.relpath(main_beads, worktree_path)
+        with contextlib.suppress(FileExistsError):
+            with open(wt_beads / "redirect", "x", encoding="utf-8") as f:
+                f.write(rel_path + "\n")
 
     # Print summary to stderr (post-checkout output goes to terminal)
     print(